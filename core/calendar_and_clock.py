@@ -6,10 +6,18 @@ Focuses on clear, simple responses suitable for elderly users.
 
 import datetime
 import calendar
+import functools
 import re
 from typing import Tuple, Optional
 import logging
 
+# Intent patterns are purely regular, so prefer the linear-time RE2 engine
+# when the google-re2 package is installed and fall back to the stdlib otherwise
+try:
+    import re2 as _regex_engine
+except ImportError:
+    _regex_engine = re
+
 # Configure logging
 logging.basicConfig(
     filename='data/calendar_clock.log',
@@ -81,37 +89,79 @@ CALENDAR_PATTERNS = [
     r"how long is this month",
 ]
 
+def _compile_union(patterns):
+    """Fuse a pattern family into one alternation so the query is scanned once."""
+    # Inline (?i) is understood by both RE2 and the stdlib, unlike flag constants
+    union = "(?i)" + "|".join(f"(?:{p})" for p in patterns)
+    try:
+        return _regex_engine.compile(union)
+    except Exception as e:
+        logging.warning(f"Falling back to stdlib regex for intent patterns: {str(e)}")
+        return re.compile(union)
+
+# The pattern lists above stay the source of truth; the compiled unions are
+# derived from them once at import
+TIME_RE = _compile_union(TIME_PATTERNS)
+DATE_RE = _compile_union(DATE_PATTERNS)
+DAY_RE = _compile_union(DAY_PATTERNS)
+CALENDAR_RE = _compile_union(CALENDAR_PATTERNS)
+DATETIME_RE = _compile_union(DATETIME_PATTERNS)
+DATETIME_DAY_RE = _compile_union(DATETIME_DAY_PATTERNS)
+
+# The detectors below expect text already normalized by process_time_query
+# (lowercased and stripped) so it isn't re-lowercased once per detector.
+
 def detect_time_intent(text: str) -> bool:
     """Check if input contains a time-related query."""
-    return any(re.search(pattern, text.lower()) for pattern in TIME_PATTERNS)
+    return TIME_RE.search(text) is not None
 
 def detect_date_intent(text: str) -> bool:
     """Check if input contains a date-related query."""
-    return any(re.search(pattern, text.lower()) for pattern in DATE_PATTERNS)
+    return DATE_RE.search(text) is not None
 
 def detect_day_intent(text: str) -> bool:
     """Check if input contains a day-of-week query."""
-    return any(re.search(pattern, text.lower()) for pattern in DAY_PATTERNS)
+    return DAY_RE.search(text) is not None
 
 def detect_calendar_intent(text: str) -> bool:
     """Check if input contains a calendar-related query."""
-    return any(re.search(pattern, text.lower()) for pattern in CALENDAR_PATTERNS)
+    return CALENDAR_RE.search(text) is not None
 
 def detect_datetime_intent(text: str) -> bool:
     """Check if input contains a combined date and time query."""
-    return any(re.search(pattern, text.lower()) for pattern in DATETIME_PATTERNS)
+    return DATETIME_RE.search(text) is not None
 
 def detect_datetime_day_intent(text: str) -> bool:
     """Check if input contains a combined date, time and day query."""
-    return any(re.search(pattern, text.lower()) for pattern in DATETIME_DAY_PATTERNS)
+    return DATETIME_DAY_RE.search(text) is not None
+
+# Last formatted response per generator, keyed by the clock fields it depends
+# on: {name: (key, (spoken, display))}. Time changes per minute, the rest per day.
+_response_cache = {}
+
+def _cache_lookup(name: str, key) -> Optional[Tuple[str, str]]:
+    """Return the cached response for `name` if it was built for `key`."""
+    entry = _response_cache.get(name)
+    if entry is not None and entry[0] == key:
+        return entry[1]
+    return None
 
-def get_current_time() -> Tuple[str, str]:
+def _cache_store(name: str, key, response: Tuple[str, str]) -> Tuple[str, str]:
+    """Remember `response` for `name` under `key` and return it."""
+    _response_cache[name] = (key, response)
+    return response
+
+def get_current_time(now: Optional[datetime.datetime] = None) -> Tuple[str, str]:
     """
     Get current time in both spoken and display formats.
     Returns: (spoken_response, display_text)
     """
     try:
-        now = datetime.datetime.now()
+        now = now or datetime.datetime.now()
+        key = (now.hour, now.minute)
+        cached = _cache_lookup('time', key)
+        if cached:
+            return cached
         
         # Windows-compatible way to get hour and minute without leading zeros
         hour = now.hour % 12
@@ -131,41 +181,44 @@ def get_current_time() -> Tuple[str, str]:
         spoken = f"It's {hour} {minute_str} {meridian}"
         display = f"🕐 {now.strftime('%I:%M %p')}"
         logging.info(f"Time request - Responded with: {spoken}")
-        return spoken, display
+        return _cache_store('time', key, (spoken, display))
         
     except Exception as e:
         logging.error(f"Error getting current time: {str(e)}")
         return ("I'm having trouble reading the time right now.", 
                 "⚠️ Error reading time")
 
+# English day and month names, used instead of locale-dependent strftime
+# lookups so Sathi always speaks the same names
+_WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+_MONTHS = ('January', 'February', 'March', 'April', 'May', 'June',
+           'July', 'August', 'September', 'October', 'November', 'December')
+
+# Ordinal suffix for every possible day of the month, indexed by day number
+_ORDINAL_SUFFIXES = tuple(
+    'th' if 10 <= day % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(day % 10, 'th')
+    for day in range(32)
+)
+
 def get_ordinal_suffix(day: int) -> str:
-    """Helper function to get the ordinal suffix for a day number."""
-    if 10 <= day % 100 <= 20:
-        suffix = 'th'
-    else:
-        suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(day % 10, 'th')
-    return f"{day}{suffix}"
-
-def get_current_date() -> Tuple[str, str]:
+    """Helper function to get the ordinal suffix for a day of the month (1-31)."""
+    return f"{day}{_ORDINAL_SUFFIXES[day]}"
+
+def get_current_date(now: Optional[datetime.datetime] = None) -> Tuple[str, str]:
     """
     Get current date in both spoken and display formats.
     Returns: (spoken_response, display_text)
     """
     try:
-        now = datetime.datetime.now()
+        now = now or datetime.datetime.now()
+        key = now.date()
+        cached = _cache_lookup('date', key)
+        if cached:
+            return cached
         
-        # Get date components safely
-        try:
-            weekday = now.strftime('%A')
-            month = now.strftime('%B')
-        except Exception as e:
-            logging.error(f"Error formatting date components: {str(e)}")
-            # Fallback to basic names
-            weekdays = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            months = ['January', 'February', 'March', 'April', 'May', 'June', 
-                     'July', 'August', 'September', 'October', 'November', 'December']
-            weekday = weekdays[now.weekday()]
-            month = months[now.month - 1]
+        # Get date components from the constant name tables
+        weekday = _WEEKDAYS[now.weekday()]
+        month = _MONTHS[now.month - 1]
         
         day = now.day
         year = now.year
@@ -178,41 +231,49 @@ def get_current_date() -> Tuple[str, str]:
         display = f"📅 {weekday}, {month} {day}, {year}"
         
         logging.info(f"Successfully generated date response: {spoken}")
-        return spoken, display
+        return _cache_store('date', key, (spoken, display))
         
     except Exception as e:
         error_msg = f"Error getting current date: {str(e)}"
         logging.error(error_msg)
         try:
             # Extremely basic fallback
-            now = datetime.datetime.now()
+            now = now or datetime.datetime.now()
             basic_response = f"Today is {now.month}/{now.day}/{now.year}"
             return (basic_response, f"📅 {basic_response}")
         except:
             return ("I'm having trouble reading today's date. Please try asking me again in a moment.",
                     "⚠️ Error reading date")
 
-def get_current_day() -> Tuple[str, str]:
+def get_current_day(now: Optional[datetime.datetime] = None) -> Tuple[str, str]:
     """
     Get current day of week in both spoken and display formats.
     Returns: (spoken_response, display_text)
     """
-    now = datetime.datetime.now()
-    day_name = now.strftime('%A')
+    now = now or datetime.datetime.now()
+    key = now.date()
+    cached = _cache_lookup('day', key)
+    if cached:
+        return cached
+    day_name = _WEEKDAYS[now.weekday()]
     spoken = f"Today is {day_name}"
     display = f"📅 {day_name}"
     logging.info(f"Day request - Responded with: {spoken}")
-    return spoken, display
+    return _cache_store('day', key, (spoken, display))
 
-def get_month_calendar() -> Tuple[str, str]:
+def get_month_calendar(now: Optional[datetime.datetime] = None) -> Tuple[str, str]:
     """
     Get current month's calendar information in both spoken and display formats.
     Returns: (spoken_response, display_text)
     """
-    now = datetime.datetime.now()
-    month_name = now.strftime("%B")
-    num_days = calendar.monthrange(now.year, now.month)[1]
-    start_day = calendar.day_name[calendar.monthrange(now.year, now.month)[0]]
+    now = now or datetime.datetime.now()
+    key = (now.year, now.month, now.day)
+    cached = _cache_lookup('calendar', key)
+    if cached:
+        return cached
+    month_name = _MONTHS[now.month - 1]
+    first_weekday, num_days = calendar.monthrange(now.year, now.month)
+    start_day = _WEEKDAYS[first_weekday]
     
     spoken = (f"We are in the month of {month_name}. "
              f"This month has {num_days} days in total. "
@@ -225,7 +286,88 @@ def get_month_calendar() -> Tuple[str, str]:
               f"• Current day: {now.day} of {num_days}")
     
     logging.info(f"Calendar request - Responded with summary for {month_name}")
-    return spoken, display
+    return _cache_store('calendar', key, (spoken, display))
+
+def get_current_datetime(now: Optional[datetime.datetime] = None) -> Tuple[str, str]:
+    """
+    Get current time and date together in spoken and display formats.
+    Returns: (spoken_response, display_text)
+    """
+    now = now or datetime.datetime.now()
+    time_spoken, time_display = get_current_time(now)
+    date_spoken, date_display = get_current_date(now)
+    return (f"{time_spoken}. {date_spoken}",
+            f"{time_display}\n{date_display}")
+
+def get_current_datetime_day(now: Optional[datetime.datetime] = None) -> Tuple[str, str]:
+    """
+    Get current time, date and day of week together in spoken and display formats.
+    Returns: (spoken_response, display_text)
+    """
+    now = now or datetime.datetime.now()
+    time_spoken, time_display = get_current_time(now)
+    date_spoken, date_display = get_current_date(now)
+    day_spoken, _ = get_current_day(now)
+    return (f"{time_spoken}. {date_spoken}. {day_spoken}",
+            f"{time_display}\n{date_display}")
+
+# Response generators per intent. These depend on now() and are never cached.
+INTENT_HANDLERS = {
+    'datetime_day': get_current_datetime_day,
+    'datetime': get_current_datetime,
+    'date': get_current_date,
+    'time': get_current_time,
+    'day': get_current_day,
+    'calendar': get_month_calendar,
+}
+
+# Log line for each (intent, partial match) result of _classify
+INTENT_LOG_MESSAGES = {
+    ('datetime_day', False): "DateTime and Day intent detected",
+    ('datetime', False): "DateTime intent detected",
+    ('date', False): "Date intent detected",
+    ('time', False): "Time intent detected",
+    ('day', False): "Day intent detected",
+    ('calendar', False): "Calendar intent detected",
+    ('datetime_day', True): "Partial datetime and day match detected",
+    ('datetime', True): "Partial datetime match detected",
+    ('date', True): "Partial date match detected",
+    ('time', True): "Partial time match detected",
+}
+
+@functools.lru_cache(maxsize=256)
+def _classify(text: str) -> Optional[Tuple[str, bool]]:
+    """
+    Classify a normalized (lowercased, stripped) query into an intent.
+    Returns (intent, partial) where intent is a key of INTENT_HANDLERS and
+    partial is True for a keyword-only match, or None if not a time query.
+    The result depends only on the text, so repeated queries are cached.
+    """
+    # First try exact pattern matching
+    if detect_datetime_day_intent(text):  # Check combined date, time and day first
+        return ('datetime_day', False)
+    elif detect_datetime_intent(text):  # Check combined date and time
+        return ('datetime', False)
+    elif detect_date_intent(text):  # Check date first since it's more specific
+        return ('date', False)
+    elif detect_time_intent(text):
+        return ('time', False)
+    elif detect_day_intent(text):
+        return ('day', False)
+    elif detect_calendar_intent(text):
+        return ('calendar', False)
+
+    # If no exact match, try partial matching for common words
+    if all(word in text for word in ['time', 'date', 'day']):  # Check for all three keywords
+        return ('datetime_day', True)
+    elif 'time' in text and 'date' in text:  # Check for combined time and date keywords
+        return ('datetime', True)
+    elif any(word in text for word in ['date', 'today', 'day', 'month']):
+        return ('date', True)
+    elif any(word in text for word in ['time', 'clock', 'hour']):
+        return ('time', True)
+
+    return None
 
 def process_time_query(text: str) -> Optional[Tuple[str, str]]:
     """
@@ -242,54 +384,12 @@ def process_time_query(text: str) -> Optional[Tuple[str, str]]:
         text = text.lower().strip()
         logging.info(f"Processing query: {text}")
         
-        # First try exact pattern matching
         try:
-            if detect_datetime_day_intent(text):  # Check combined date, time and day first
-                logging.info("DateTime and Day intent detected")
-                time_spoken, time_display = get_current_time()
-                date_spoken, date_display = get_current_date()
-                day_spoken, _ = get_current_day()
-                return (f"{time_spoken}. {date_spoken}. {day_spoken}", 
-                       f"{time_display}\n{date_display}")
-            elif detect_datetime_intent(text):  # Check combined date and time
-                logging.info("DateTime intent detected")
-                time_spoken, time_display = get_current_time()
-                date_spoken, date_display = get_current_date()
-                return (f"{time_spoken}. {date_spoken}", 
-                       f"{time_display}\n{date_display}")
-            elif detect_date_intent(text):  # Check date first since it's more specific
-                logging.info("Date intent detected")
-                return get_current_date()
-            elif detect_time_intent(text):
-                logging.info("Time intent detected")
-                return get_current_time()
-            elif detect_day_intent(text):
-                logging.info("Day intent detected")
-                return get_current_day()
-            elif detect_calendar_intent(text):
-                logging.info("Calendar intent detected")
-                return get_month_calendar()
-            
-            # If no exact match, try partial matching for common words
-            if all(word in text for word in ['time', 'date', 'day']):  # Check for all three keywords
-                logging.info("Partial datetime and day match detected")
-                time_spoken, time_display = get_current_time()
-                date_spoken, date_display = get_current_date()
-                day_spoken, _ = get_current_day()
-                return (f"{time_spoken}. {date_spoken}. {day_spoken}", 
-                       f"{time_display}\n{date_display}")
-            elif 'time' in text and 'date' in text:  # Check for combined time and date keywords
-                logging.info("Partial datetime match detected")
-                time_spoken, time_display = get_current_time()
-                date_spoken, date_display = get_current_date()
-                return (f"{time_spoken}. {date_spoken}", 
-                       f"{time_display}\n{date_display}")
-            elif any(word in text for word in ['date', 'today', 'day', 'month']):
-                logging.info("Partial date match detected")
-                return get_current_date()
-            elif any(word in text for word in ['time', 'clock', 'hour']):
-                logging.info("Partial time match detected")
-                return get_current_time()
+            match = _classify(text)
+            if match is not None:
+                logging.info(INTENT_LOG_MESSAGES[match])
+                # Read the clock once per query and share it across handlers
+                return INTENT_HANDLERS[match[0]](datetime.datetime.now())
                 
         except Exception as e:
             logging.error(f"Error in intent processing: {str(e)}")
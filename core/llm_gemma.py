@@ -1,4 +1,9 @@
 import os
+import re
+import time
+import logging
+from collections import OrderedDict, deque
+import numpy as np
 import google.generativeai as genai
 
 # Configure API Key
@@ -24,10 +29,98 @@ You are Sathi, a gentle elder care companion. Follow these guidelines:
 
 Be their trusted friend. Make them feel safe."""
 
-model = genai.GenerativeModel("gemini-2.5-flash") 
+# Pass the system prompt once as the model's system instruction instead of
+# prepending it to every request, so it can be reused as a cached prefix
+model = genai.GenerativeModel("gemini-2.5-flash", system_instruction=SYSTEM_PROMPT)
+
+# Response cache: exact repeats are answered from an LRU; close paraphrases
+# ("how are you" / "how are you today") from a semantic cache when the
+# optional sentence-transformers package is installed
+EXACT_CACHE_SIZE = 256
+SEMANTIC_CACHE_SIZE = 256
+SEMANTIC_THRESHOLD = 0.92
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+RESPONSE_CACHE_TTL = 7 * 24 * 3600  # seconds before a cached response is fetched again
+
+# Answers to these change over time, so they are never cached
+# (same rule as the answer cache in whisper.cpp/ask_loop.py)
+TIME_SENSITIVE_RE = re.compile(
+    r"\b(time|date|day|today|tonight|tomorrow|yesterday|now|week|month|year|"
+    r"morning|evening|weather|news|latest|current)\b")
+
+_exact_cache = OrderedDict()  # key -> (response, time cached)
+_semantic_cache = deque(maxlen=SEMANTIC_CACHE_SIZE)  # (unit embedding, response, time cached)
+_embedder = None
+_embedder_unavailable = False
+
+def _get_embedder():
+    """Load the local embedding model on first use, or return None if unavailable."""
+    global _embedder, _embedder_unavailable
+    if _embedder is None and not _embedder_unavailable:
+        try:
+            from sentence_transformers import SentenceTransformer
+            _embedder = SentenceTransformer(EMBEDDING_MODEL)
+        except Exception as e:
+            logging.info(f"Semantic response cache disabled: {str(e)}")
+            _embedder_unavailable = True
+    return _embedder
+
+def _embed(text: str):
+    """Return a unit-length embedding for `text`, or None without an embedder."""
+    embedder = _get_embedder()
+    if embedder is None:
+        return None
+    try:
+        return embedder.encode(text, normalize_embeddings=True)
+    except Exception as e:
+        logging.warning(f"Embedding failed, skipping semantic cache: {str(e)}")
+        return None
+
+def _semantic_lookup(embedding):
+    """Return (response, time cached) for the entry closest to `embedding` if it is similar enough."""
+    # Expired entries are the oldest, so they sit at the left of the deque
+    cutoff = time.time() - RESPONSE_CACHE_TTL
+    while _semantic_cache and _semantic_cache[0][2] < cutoff:
+        _semantic_cache.popleft()
+    if embedding is None or not _semantic_cache:
+        return None
+    embeddings = np.stack([e for e, _, _ in _semantic_cache])
+    scores = embeddings @ embedding
+    best = int(np.argmax(scores))
+    if scores[best] >= SEMANTIC_THRESHOLD:
+        return _semantic_cache[best][1:]
+    return None
+
+def _remember(key: str, embedding, response: str, cached_at: float = None) -> None:
+    """Store a response in the exact cache and, given an embedding, the semantic cache."""
+    now = cached_at if cached_at is not None else time.time()
+    _exact_cache[key] = (response, now)
+    _exact_cache.move_to_end(key)
+    if len(_exact_cache) > EXACT_CACHE_SIZE:
+        _exact_cache.popitem(last=False)
+    if embedding is not None:
+        _semantic_cache.append((embedding, response, now))
 
 def query_gemma(prompt: str) -> str:
-    # Prepend system prompt before user prompt
-    full_prompt = f"{SYSTEM_PROMPT}\nUser: {prompt}"
-    response = model.generate_content(full_prompt)
+    """Answer `prompt`, reusing a cached response before calling Gemini."""
+    key = " ".join(prompt.lower().split())
+    if TIME_SENSITIVE_RE.search(key):
+        return model.generate_content(prompt).text
+
+    cached = _exact_cache.get(key)
+    if cached is not None:
+        if time.time() - cached[1] < RESPONSE_CACHE_TTL:
+            _exact_cache.move_to_end(key)
+            return cached[0]
+        del _exact_cache[key]
+
+    embedding = _embed(key)
+    cached = _semantic_lookup(embedding)
+    if cached is not None:
+        # Keep the original time so a paraphrase doesn't extend its life
+        _remember(key, None, *cached)
+        return cached[0]
+
+    response = model.generate_content(prompt)
+    _remember(key, embedding, response.text)
     return response.text
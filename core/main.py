@@ -3,8 +3,14 @@ import os
 import sys
 import re
 from pathlib import Path
-from difflib import SequenceMatcher
 import random
+from rapidfuzz import fuzz, process
+
+# Optional: pyahocorasick finds every wake-word literal in one pass
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # Ensure project root is added to sys.path for absolute imports
 project_root = Path(__file__).resolve().parent.parent
@@ -50,6 +56,49 @@ SATHI_GREETINGS = [
     "I'm your assistant Sathi. Please let me know how I can help you."
 ]
 
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9 ]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def _normalize(text):
+    """Lowercase, drop punctuation and collapse whitespace."""
+    norm = _NON_ALNUM_RE.sub(' ', text.lower())
+    return _WHITESPACE_RE.sub(' ', norm).strip()
+
+# Normalize the wake words once at import: (phrase, tokens, token set)
+WAKE_WORDS_NORMALIZED = [
+    (w, w.split(), frozenset(w.split()))
+    for w in (_normalize(wake) for wake in WAKE_WORDS)
+    if w
+]
+
+def _build_wake_automaton():
+    """Build an Aho-Corasick automaton over the wake literals, if available."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for w, _, _ in WAKE_WORDS_NORMALIZED:
+        automaton.add_word(w, w)
+    automaton.make_automaton()
+    return automaton
+
+WAKE_AUTOMATON = _build_wake_automaton()
+
+# Transcriptions longer than this are not fuzzy-scored in is_wake_word
+MAX_WAKE_TOKENS = 6
+MAX_WAKE_CHARS = 40
+
+# Lookup tables for the batched fuzzy pass in is_wake_word
+WAKE_TOKENS = sorted({t for _, w_tokens, _ in WAKE_WORDS_NORMALIZED for t in w_tokens})
+WAKE_PHRASES_BY_LEN = {}
+for _w, _w_tokens, _ in WAKE_WORDS_NORMALIZED:
+    WAKE_PHRASES_BY_LEN.setdefault(len(_w_tokens), []).append(_w)
+
+def _contains_wake_literal(norm):
+    """Return True if any normalized wake word occurs as a substring of `norm`."""
+    if WAKE_AUTOMATON is not None:
+        return next(WAKE_AUTOMATON.iter(norm), None) is not None
+    return any(w in norm for w, _, _ in WAKE_WORDS_NORMALIZED)
+
 def is_wake_word(text, span_threshold=0.65, token_threshold=0.85):
     """
     Improved wake-word scoring.
@@ -61,46 +110,56 @@ def is_wake_word(text, span_threshold=0.65, token_threshold=0.85):
     - normalize text (lowercase, remove punctuation)
     - exact match or substring -> high score
     - token-subset match -> high score
-    - sliding window token comparisons using SequenceMatcher -> span_threshold
+    - sliding window token comparisons using RapidFuzz's ratio -> span_threshold
     - single-token fuzzy matches (e.g. "sathi" vs "sathy") -> token_threshold
 
+    The exact, substring and token-subset checks run against every wake
+    word before any fuzzy scoring, so a clean "sathi" never reaches the
+    fuzzy pass. The fuzzy scores are computed up front with RapidFuzz's
+    cdist so the comparison loops run in native code; the wake words are
+    then walked in order exactly as before.
+
     This returns the best score found. Callers should decide cutoffs.
     """
     if not text:
         return 0.0
 
     # Normalize incoming text
-    norm = re.sub(r'[^a-z0-9 ]', ' ', text.lower())
-    norm = re.sub(r'\s+', ' ', norm).strip()
+    norm = _normalize(text)
     tokens = norm.split()
+    token_set = set(tokens)
+
+    # Fast paths: exact match, substring, token subset
+    if any(norm == w for w, _, _ in WAKE_WORDS_NORMALIZED):
+        return 1.0
+    if _contains_wake_literal(norm):
+        return 0.95
+    if any(w_set <= token_set for _, _, w_set in WAKE_WORDS_NORMALIZED):
+        return 0.9
+
+    # Wake phrases are at most four words, so a long transcription can only be
+    # a wake word through the literal checks above; skip the fuzzy pass
+    if not tokens or len(tokens) > MAX_WAKE_TOKENS or len(norm) > MAX_WAKE_CHARS:
+        return 0.0
 
-    best_score = 0.0
-
-    for wake in WAKE_WORDS:
-        w = re.sub(r'[^a-z0-9 ]', ' ', wake.lower()).strip()
-        w = re.sub(r'\s+', ' ', w)
-        if not w:
-            continue
-
-        # exact full-string match
-        if norm == w:
-            return 1.0
-
-        # substring match -> strong signal
-        if w in norm:
-            return 0.95
-
-        w_tokens = w.split()
+    # Score every window against every wake phrase of the same length, and
+    # every wake token against every transcribed token, in native cdist calls
+    window_scores = {}
+    for win_len, phrases in WAKE_PHRASES_BY_LEN.items():
+        windows = [' '.join(tokens[i:i + win_len])
+                   for i in range(0, max(1, len(tokens) - win_len + 1))]
+        matrix = process.cdist(windows, phrases, scorer=fuzz.ratio)
+        for col, phrase in enumerate(phrases):
+            window_scores[phrase] = matrix[:, col]
+    token_matrix = process.cdist(WAKE_TOKENS, tokens, scorer=fuzz.ratio)
+    token_scores = dict(zip(WAKE_TOKENS, token_matrix.max(axis=1)))
 
-        # token-subset (all wake tokens present somewhere)
-        if all(t in tokens for t in w_tokens):
-            return 0.9
+    best_score = 0.0
 
+    for w, w_tokens, _ in WAKE_WORDS_NORMALIZED:
         # sliding window over tokens for phrase-level fuzzy match
-        win_len = max(1, len(w_tokens))
-        for i in range(0, max(1, len(tokens) - win_len + 1)):
-            window = ' '.join(tokens[i:i + win_len])
-            score = SequenceMatcher(None, window, w).ratio()
+        for score in window_scores[w]:
+            score = float(score) / 100.0
             if score > best_score:
                 best_score = score
             if score >= span_threshold:
@@ -108,12 +167,11 @@ def is_wake_word(text, span_threshold=0.65, token_threshold=0.85):
 
         # single-token fuzzy match (helps when transcription mangles one word)
         for wt in w_tokens:
-            for tk in tokens:
-                s = SequenceMatcher(None, tk, wt).ratio()
-                if s > best_score:
-                    best_score = s
-                if s >= token_threshold:
-                    return s
+            s = float(token_scores[wt]) / 100.0
+            if s > best_score:
+                best_score = s
+            if s >= token_threshold:
+                return s
 
     return best_score
 
@@ -124,15 +182,15 @@ def sathi_interaction():
     print("\n Sathi: I'm listening...")
 
     # Step 1: Record user's voice input with better duration for elderly users
-    audio_path = record_audio(duration=8)  # Increased duration for slower speech
+    recording = record_audio(duration=8, return_audio=True)  # Increased duration for slower speech
 
-    if not audio_path:
+    if not recording:
         print("\n❌ I couldn't hear you clearly. Please try again.")
         print("💡 Tip: Speak a little louder and closer to the microphone")
         return
 
     # Step 2: Transcribe
-    transcription = transcribe_audio(audio_path)
+    transcription = transcribe_audio(recording)
     if not transcription:
         print("❌ Could not recognize speech.")
         return
@@ -173,8 +231,8 @@ def sathi_interaction():
         return
 
     # Step 4: Speak response with male voice
-    speak_text(response, use_male_voice=True)
-    text_to_speech(response, use_male_voice=True)
+    if not speak_text(response, use_male_voice=True):
+        text_to_speech(response, use_male_voice=True)
 
 def sathi_assistant():
     """
@@ -190,8 +248,8 @@ def sathi_assistant():
 
     # Step 1: Wait for wake word
     while True:
-        audio_path = record_audio(duration=5, filename="data/audio/listen.wav")
-        transcription = transcribe_audio(audio_path)
+        recording = record_audio(duration=5, filename="data/audio/listen.wav", return_audio=True)
+        transcription = transcribe_audio(recording)
 
         if not transcription:
             print("No speech detected. Listening again...\n")
@@ -209,67 +267,12 @@ def sathi_assistant():
             print("Wake word detected!")
             greeting = random.choice(SATHI_GREETINGS)
             print(f"Sathi: {greeting}")
-            speak_text(greeting, use_male_voice=True)
-            text_to_speech(greeting, use_male_voice=True)
+            if not speak_text(greeting, use_male_voice=True):
+                text_to_speech(greeting, use_male_voice=True)
             break
         else:
             print("Wake word not found. Listening again...\n")
             time.sleep(0.8)
-            continue
-
-        # Keep original transcription for fuzzy matching (more info)
-        norm_trans = transcription.strip()
-        print(f"Heard: {norm_trans}")
-
-        # Get a confidence score (0.0 - 1.0)
-        score = is_wake_word(norm_trans)
-        print(f"Wake-word score: {score:.2f}")
-
-        # Strong signal: accept immediately
-        if score >= 0.9:
-            print(" Wake word detected (confident)!")
-
-            # Pick a random warm greeting
-            greeting = random.choice(SATHI_GREETINGS)
-            print(f"Sathi: {greeting}")
-            speak_text(greeting, use_male_voice=True)
-            text_to_speech(greeting, use_male_voice=True)
-
-            # Start conversation directly (no extra “yes sir” pause)
-            break
-        # Borderline: ask for a quick confirmation (helps reduce misses)
-        elif score >= 0.55:
-            print("Wake word borderline — asking for confirmation...")
-            # Ask a short spoken confirmation
-            confirm_prompt = "Did you say Sathi? Please say yes or no."
-            speak_text(confirm_prompt, use_male_voice=True)
-            text_to_speech(confirm_prompt, use_male_voice=True)
-
-            # Short re-listen
-            confirm_audio = record_audio(duration=3, filename="data/audio/confirm.wav")
-            confirm_trans = transcribe_audio(confirm_audio) if confirm_audio else None
-            if confirm_trans:
-                ct = confirm_trans.lower()
-                print(f"Confirmation heard: {ct}")
-                if any(w in ct for w in ("yes", "yeah", "yup", "ya", "correct", "right")):
-                    print("User confirmed wake word.")
-                    greeting = random.choice(SATHI_GREETINGS)
-                    print(f"Sathi: {greeting}")
-                    speak_text(greeting, use_male_voice=True)
-                    text_to_speech(greeting, use_male_voice=True)
-                    break
-                else:
-                    print("Confirmation negative — continuing to listen...\n")
-                    time.sleep(0.5)
-                    continue
-            else:
-                print("No confirmation heard — continuing to listen...\n")
-                time.sleep(0.5)
-                continue
-
-        else:
-            print("Wake word not found. Listening again...\n")
-            time.sleep(1)
 
     # Step 2: Continuous conversation
     while True:
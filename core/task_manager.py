@@ -11,6 +11,9 @@ import logging
 from typing import List, Dict, Optional
 import time
 from pathlib import Path
+import threading
+import atexit
+from contextlib import contextmanager
 
 # Configure logging
 # Get the absolute path to the project root
@@ -40,6 +43,83 @@ logging.info(f"Project root: {PROJECT_ROOT}")
 logging.info(f"Database path: {DB_PATH}")
 logging.info("Setting up database...")
 
+# SQL statements, kept as module constants so each query's text is defined
+# once. sqlite3's prepared statement cache is keyed by SQL text, so the reuse
+# comes from the persistent connection below and its cached_statements=64.
+SQL_INSERT_TASK = """
+    INSERT INTO tasks (time, message, repeat_daily)
+    VALUES (?, ?, ?)
+"""
+
+SQL_FETCH_ACTIVE_TASKS = """
+    SELECT id, time, message, repeat_daily, last_run
+    FROM tasks
+    WHERE is_active = 1
+    ORDER BY time
+"""
+
+SQL_UPDATE_LAST_RUN = """
+    UPDATE tasks
+    SET last_run = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+SQL_DEACTIVATE_TASK = """
+    UPDATE tasks
+    SET is_active = 0
+    WHERE id = ?
+"""
+
+# A single persistent connection shared by all threads (the scheduler runs in
+# its own thread, Flask serves requests from worker threads). Access is
+# serialized by _conn_lock, which is what makes check_same_thread=False safe.
+_conn = None
+_conn_lock = threading.RLock()
+
+def _get_conn() -> sqlite3.Connection:
+    """Return the shared database connection, opening it on first use."""
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(str(DB_PATH), timeout=20, check_same_thread=False,
+                                cached_statements=64)
+        _conn.row_factory = sqlite3.Row  # This enables column access by name
+        # WAL lets readers and the writer proceed concurrently and, with
+        # synchronous=NORMAL, avoids an fsync on every commit
+        _conn.execute('PRAGMA journal_mode=WAL')
+        _conn.execute('PRAGMA synchronous=NORMAL')
+    return _conn
+
+@contextmanager
+def _connection():
+    """
+    Hold the connection lock and yield the shared connection.
+    Rolls back any open transaction if the body raises.
+    """
+    with _conn_lock:
+        conn = _get_conn()
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+
+# Whether init_db has run in this process (see _ensure_db)
+_initialized = False
+
+# Set whenever this process adds or removes a task so the scheduler can
+# re-read the task list without polling the database
+tasks_changed = threading.Event()
+
+@atexit.register
+def _close_conn() -> None:
+    """Close the shared connection at interpreter exit."""
+    global _conn
+    with _conn_lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+
+
 def init_db() -> None:
     """
     Initialize the SQLite database and create the tasks table if it doesn't exist.
@@ -48,45 +128,39 @@ def init_db() -> None:
         # Log database connection attempt
         logging.info(f"Attempting to connect to database: {DB_PATH}")
         
-        # Create a new database connection
-        conn = sqlite3.connect(str(DB_PATH), timeout=20)
-        cursor = conn.cursor()
-        
-        # Create tasks table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                time TEXT NOT NULL,
-                message TEXT NOT NULL,
-                is_active BOOLEAN DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_run TIMESTAMP,
-                repeat_daily BOOLEAN DEFAULT 1
-            )
-        ''')
-        
-        # Create tasks table with necessary fields
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                time TEXT NOT NULL,           -- HH:MM format
-                message TEXT NOT NULL,        -- Elderly-friendly reminder message
-                is_active BOOLEAN DEFAULT 1,  -- For soft deletion
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_run TIMESTAMP,          -- Last time this reminder was announced
-                repeat_daily BOOLEAN DEFAULT 1  -- Whether task repeats daily
-            )
-        ''')
-        
-        conn.commit()
+        with _connection() as conn:
+            cursor = conn.cursor()
+            
+            # Create tasks table with necessary fields
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    time TEXT NOT NULL,           -- HH:MM format
+                    message TEXT NOT NULL,        -- Elderly-friendly reminder message
+                    is_active BOOLEAN DEFAULT 1,  -- For soft deletion
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_run TIMESTAMP,          -- Last time this reminder was announced
+                    repeat_daily BOOLEAN DEFAULT 1  -- Whether task repeats daily
+                )
+            ''')
+            
+            conn.commit()
         logging.info("Database initialized successfully")
         
     except Exception as e:
         logging.error(f"Error initializing database: {str(e)}")
         raise
-    finally:
-        if 'conn' in locals():
-            conn.close()
+
+def _ensure_db() -> None:
+    """
+    Run init_db the first time the database is used in this process,
+    rather than on import.
+    """
+    global _initialized
+    with _conn_lock:
+        if not _initialized:
+            init_db()
+            _initialized = True
 
 def add_task(time_str: str, message: str, repeat_daily: bool = True) -> bool:
     """
@@ -100,7 +174,6 @@ def add_task(time_str: str, message: str, repeat_daily: bool = True) -> bool:
     Returns:
         bool: True if task was added successfully
     """
-    conn = None
     try:
         # Validate time format
         try:
@@ -109,28 +182,18 @@ def add_task(time_str: str, message: str, repeat_daily: bool = True) -> bool:
             logging.error(f"Invalid time format: {time_str}")
             return False
         
-        # Ensure database file exists
-        if not DB_PATH.exists():
-            init_db()
+        _ensure_db()
+        with _connection() as conn:
+            conn.execute(SQL_INSERT_TASK, (time_str, message, repeat_daily))
             
-        conn = sqlite3.connect(str(DB_PATH), timeout=20)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO tasks (time, message, repeat_daily)
-            VALUES (?, ?, ?)
-        ''', (time_str, message, repeat_daily))
-        
-        conn.commit()
+            conn.commit()
         logging.info(f"Added new task: {time_str} - {message}")
+        tasks_changed.set()
         return True
         
     except Exception as e:
         logging.error(f"Error adding task: {str(e)}")
         return False
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
 def fetch_tasks() -> List[Dict]:
     """
@@ -140,27 +203,32 @@ def fetch_tasks() -> List[Dict]:
         List of dictionaries containing task details
     """
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        conn.row_factory = sqlite3.Row  # This enables column access by name
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT id, time, message, repeat_daily, last_run
-            FROM tasks
-            WHERE is_active = 1
-            ORDER BY time
-        ''')
-        
-        tasks = [dict(row) for row in cursor.fetchall()]
+        _ensure_db()
+        with _connection() as conn:
+            tasks = [dict(row) for row in conn.execute(SQL_FETCH_ACTIVE_TASKS)]
         logging.info(f"Fetched {len(tasks)} active tasks")
         return tasks
         
     except Exception as e:
         logging.error(f"Error fetching tasks: {str(e)}")
         return []
-    finally:
-        if 'conn' in locals():
-            conn.close()
+
+def get_data_version() -> Optional[int]:
+    """
+    Return SQLite's data_version for the shared connection.
+    The value changes whenever another connection (for example the admin
+    interface running in a separate process) commits a change.
+    
+    Returns:
+        The current data_version, or None if it could not be read
+    """
+    try:
+        _ensure_db()
+        with _connection() as conn:
+            return conn.execute('PRAGMA data_version').fetchone()[0]
+    except Exception as e:
+        logging.error(f"Error reading data_version: {str(e)}")
+        return None
 
 def update_last_run(task_id: int) -> None:
     """
@@ -170,23 +238,15 @@ def update_last_run(task_id: int) -> None:
         task_id: ID of the task to update
     """
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE tasks
-            SET last_run = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', (task_id,))
-        
-        conn.commit()
+        _ensure_db()
+        with _connection() as conn:
+            conn.execute(SQL_UPDATE_LAST_RUN, (task_id,))
+            
+            conn.commit()
         logging.info(f"Updated last_run for task {task_id}")
         
     except Exception as e:
         logging.error(f"Error updating task last_run: {str(e)}")
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
 def delete_task(task_id: int) -> bool:
     """
@@ -199,25 +259,15 @@ def delete_task(task_id: int) -> bool:
         bool: True if task was deleted successfully
     """
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE tasks
-            SET is_active = 0
-            WHERE id = ?
-        ''', (task_id,))
-        
-        conn.commit()
+        _ensure_db()
+        with _connection() as conn:
+            conn.execute(SQL_DEACTIVATE_TASK, (task_id,))
+            
+            conn.commit()
         logging.info(f"Deleted task {task_id}")
+        tasks_changed.set()
         return True
         
     except Exception as e:
         logging.error(f"Error deleting task: {str(e)}")
-        return False
-    finally:
-        if 'conn' in locals():
-            conn.close()
-
-# Initialize database when module is imported
-init_db()
\ No newline at end of file
+        return False
\ No newline at end of file
@@ -3,14 +3,15 @@ Task scheduler for Sathi AI assistant.
 Manages the timing and execution of tasks/reminders.
 """
 
-import schedule
+import heapq
 import time
-from datetime import datetime
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
 import logging
-from typing import Dict, List
+from typing import Dict, List, Tuple
 import threading
 
-from core.task_manager import fetch_tasks, update_last_run
+from core.task_manager import fetch_tasks, update_last_run, get_data_version, tasks_changed
 from core.tts_output import speak_text
 
 # Configure logging
@@ -20,6 +21,14 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+# Longest the scheduler sleeps before checking whether another process
+# (e.g. the admin interface) changed the tasks
+RESCAN_INTERVAL = 60
+
+# A reminder whose fire time passed more than this many seconds ago (e.g. the
+# machine was asleep) is skipped rather than announced late
+MISSED_GRACE = 60
+
 def announce_task(task: Dict) -> None:
     """
     Announce a task using text-to-speech.
@@ -44,38 +53,120 @@ def announce_task(task: Dict) -> None:
     except Exception as e:
         logging.error(f"Error announcing task: {str(e)}")
 
-def check_tasks() -> None:
+def next_fire_time(time_str: str, now: datetime) -> float:
+    """
+    Get the next time a task at HH:MM is due, strictly after `now`.
+    
+    Returns:
+        The due time as a POSIX timestamp
+    """
+    hour, minute = map(int, time_str.split(':'))
+    fire = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if fire <= now:
+        fire += timedelta(days=1)
+    return fire.timestamp()
+
+def ran_since(task: Dict, fire_time: float) -> bool:
     """
-    Check current time against scheduled tasks and announce any that match.
+    Check whether a task was already announced at or after `fire_time`.
+    last_run is stored by SQLite's CURRENT_TIMESTAMP, which is UTC.
     """
+    last_run = task.get('last_run')
+    if not last_run:
+        return False
     try:
-        current_time = datetime.now().strftime("%H:%M")
-        tasks = fetch_tasks()
-        
-        for task in tasks:
-            if task['time'] == current_time:
-                # Check if task should run (for non-daily tasks)
-                if task['repeat_daily'] or not task.get('last_run'):
+        ran_at = datetime.fromisoformat(str(last_run)).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return False
+    return ran_at.timestamp() >= fire_time
+
+def build_schedule() -> Tuple[List[Tuple[float, str]], Dict[str, List[Dict]]]:
+    """
+    Index the tasks that are still due by their HH:MM time.
+    Tasks that don't repeat daily are left out once they have run.
+    A time that passed less than MISSED_GRACE seconds ago is kept for today
+    while it still has tasks that haven't been announced, so a reminder
+    added just before it is due (and only seen by the next rescan) still fires.
+    
+    Returns:
+        (queue, tasks_by_time): a heap of (fire_time, "HH:MM") with one entry
+        per distinct time, and the tasks due at each time
+    """
+    now = datetime.now()
+    now_ts = now.timestamp()
+    tasks_by_time = defaultdict(list)
+    for task in fetch_tasks():
+        # Check if task should run (for non-daily tasks)
+        if task['repeat_daily'] or not task.get('last_run'):
+            tasks_by_time[task['time']].append(task)
+
+    queue = []
+    for time_str in list(tasks_by_time):
+        try:
+            fire_time = next_fire_time(time_str, now)
+            just_passed = fire_time - 86400
+            if (now_ts - just_passed <= MISSED_GRACE
+                    and not all(ran_since(task, just_passed) for task in tasks_by_time[time_str])):
+                fire_time = just_passed
+            queue.append((fire_time, time_str))
+        except ValueError:
+            logging.error(f"Skipping tasks with invalid time: {time_str}")
+            del tasks_by_time[time_str]
+    heapq.heapify(queue)
+    return queue, tasks_by_time
+
+def run_scheduler() -> None:
+    """
+    Sleep until the earliest task time is due, announce its tasks and
+    reschedule the daily ones.
+    The task list is re-read only when it changes: immediately for changes made
+    in this process, and within RESCAN_INTERVAL for changes by other processes.
+    """
+    queue, tasks_by_time = build_schedule()
+    version = get_data_version()
+    logging.info(f"Scheduled tasks at {len(queue)} times")
+
+    while True:
+        delay = queue[0][0] - time.time() if queue else float('inf')
+        if delay > 0:
+            timeout = min(delay, RESCAN_INTERVAL)
+            if tasks_changed.wait(timeout):
+                tasks_changed.clear()
+                queue, tasks_by_time = build_schedule()
+                logging.info(f"Tasks changed - rescheduled tasks at {len(queue)} times")
+            elif timeout < delay:
+                # Woke up only to rescan, not because the earliest task is due
+                current_version = get_data_version()
+                if current_version != version:
+                    version = current_version
+                    queue, tasks_by_time = build_schedule()
+                    logging.info(f"Tasks changed externally - rescheduled tasks at {len(queue)} times")
+            continue
+
+        fire_time, time_str = heapq.heappop(queue)
+        due = tasks_by_time.get(time_str, [])
+        if -delay <= MISSED_GRACE:
+            for task in due:
+                # A rebuild can requeue a slot that already fired
+                if not ran_since(task, fire_time):
                     announce_task(task)
-        
-    except Exception as e:
-        logging.error(f"Error checking tasks: {str(e)}")
+        else:
+            logging.warning(f"Skipped {len(due)} missed reminders due at {time_str}")
+
+        # Only daily tasks run again; the slot is dropped once none are left
+        daily = [task for task in due if task['repeat_daily']]
+        if daily:
+            tasks_by_time[time_str] = daily
+            heapq.heappush(queue, (next_fire_time(time_str, datetime.now()), time_str))
+        else:
+            tasks_by_time.pop(time_str, None)
 
 def start_scheduler() -> None:
     """
     Start the task scheduler in a separate thread.
-    Checks tasks every minute.
+    The thread sleeps until the next reminder is due instead of polling.
     """
-    def run_scheduler():
-        # Schedule the task checker to run every minute
-        schedule.every().minute.at(":00").do(check_tasks)
-        
-        # Run the scheduler loop
-        while True:
-            schedule.run_pending()
-            time.sleep(1)
-    
     # Start scheduler in a separate thread
     scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
     scheduler_thread.start()
-    logging.info("Task scheduler started")
\ No newline at end of file
+    logging.info("Task scheduler started")
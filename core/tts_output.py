@@ -1,62 +1,117 @@
 import pyttsx3
 import os
+import re
+import tempfile
+import threading
 from datetime import datetime
 
-def text_to_speech(text, output_dir="data/audio", use_male_voice=False):
+# pyttsx3.init() loads the speech driver and enumerates the installed voices,
+# so the engine is created once and reused. runAndWait() isn't reentrant and
+# reminders are spoken from the scheduler thread, so all use goes through
+# _engine_lock.
+_engine = None
+_engine_lock = threading.Lock()
+
+# Voice ids found by a single scan of the installed voices on first use
+_voice_table_ready = False
+_MALE_VOICE_ID = None
+_FEMALE_VOICE_ID = None
+_DEFAULT_VOICE_ID = None
+
+# Voice-name patterns; \b keeps "female" from also counting as "male"
+_MALE_VOICE_RE = re.compile(r'david|\bmale', re.IGNORECASE)
+_FEMALE_VOICE_RE = re.compile(r'zira|female', re.IGNORECASE)
+
+def _get_engine():
+    """Return the shared TTS engine, initializing it on first use."""
+    global _engine
+    if _engine is None:
+        _engine = pyttsx3.init()
+    return _engine
+
+def _init_voice_table(engine):
+    """Scan the installed voices once and remember the male, female and default ids."""
+    global _voice_table_ready, _MALE_VOICE_ID, _FEMALE_VOICE_ID, _DEFAULT_VOICE_ID
+    if _voice_table_ready:
+        return
+    voices = engine.getProperty('voices')
+    for voice in voices:
+        if _MALE_VOICE_ID is None and _MALE_VOICE_RE.search(voice.name):
+            _MALE_VOICE_ID = voice.id
+        if _FEMALE_VOICE_ID is None and _FEMALE_VOICE_RE.search(voice.name):
+            _FEMALE_VOICE_ID = voice.id
+    if voices:
+        _DEFAULT_VOICE_ID = voices[0].id
+    _voice_table_ready = True
+
+def _resolve_voice(engine, use_male_voice):
+    """
+    Look up the voice to use for the requested gender.
+    Returns (voice_id, preferred): voice_id is None when no voices are
+    installed, preferred is False when falling back to the first voice.
+    """
+    _init_voice_table(engine)
+    preferred_id = _MALE_VOICE_ID if use_male_voice else _FEMALE_VOICE_ID
+    if preferred_id:
+        return preferred_id, True
+    return _DEFAULT_VOICE_ID, False
+
+def text_to_speech(text, output_dir="data/audio", use_male_voice=False, return_bytes=False):
     """
     Convert text to speech and save as audio file
     Args:
         text (str): Text to convert to speech
         output_dir (str): Directory to save audio file
         use_male_voice (bool): If True, uses male voice; if False, uses female voice
+        return_bytes (bool): If True, return the WAV data instead of keeping a file
     """
+    output_file = None
     try:
-        # Create output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Initialize TTS engine
-        engine = pyttsx3.init()
-        
-        # Set properties
-        engine.setProperty('rate', 120)  # slower for elderly
-        engine.setProperty('volume', 0.9)  # Volume level (0.0 to 1.0)
-        
-        # Get available voices
-        voices = engine.getProperty('voices')
-        
-        # Select voice based on preference
-        selected_voice = None
-        for voice in voices:
-            voice_name = voice.name.lower()
-            if use_male_voice:
-                if 'david' in voice_name or 'male' in voice_name:
-                    selected_voice = voice.id
-                    break
-            else:
-                if 'zira' in voice_name or 'female' in voice_name:
-                    selected_voice = voice.id
-                    break
-        
-        # If preferred voice type not found, use the first available voice
-        if selected_voice:
-            engine.setProperty('voice', selected_voice)
-        elif voices:
-            engine.setProperty('voice', voices[0].id)
-        
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = os.path.join(output_dir, f"response_{timestamp}.wav")
+        if return_bytes:
+            # pyttsx3 drivers can only render to a path, so use a temp file
+            # and hand back its contents
+            fd, output_file = tempfile.mkstemp(suffix=".wav")
+            os.close(fd)
+        else:
+            # Create output directory if it doesn't exist
+            os.makedirs(output_dir, exist_ok=True)
         
-        # Save to file
-        engine.save_to_file(text, output_file)
-        engine.runAndWait()
+        with _engine_lock:
+            engine = _get_engine()
+            
+            # Set properties
+            engine.setProperty('rate', 120)  # slower for elderly
+            engine.setProperty('volume', 0.9)  # Volume level (0.0 to 1.0)
+            
+            # If preferred voice type not found, use the first available voice
+            voice_id, _ = _resolve_voice(engine, use_male_voice)
+            if voice_id:
+                engine.setProperty('voice', voice_id)
+            
+            # Generate filename with timestamp
+            if not return_bytes:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                output_file = os.path.join(output_dir, f"response_{timestamp}.wav")
+            
+            # Save to file
+            engine.save_to_file(text, output_file)
+            engine.runAndWait()
         
+        if return_bytes:
+            with open(output_file, 'rb') as f:
+                return f.read()
         print(f"🔊 Audio response saved: {output_file}")
         return output_file
         
     except Exception as e:
         print(f"❌ TTS Error: {e}")
         return None
+    finally:
+        if return_bytes and output_file:
+            try:
+                os.unlink(output_file)
+            except OSError:
+                pass
 
 def speak_text(text, use_male_voice=False):
     """
@@ -70,39 +125,26 @@ def speak_text(text, use_male_voice=False):
         return
         
     try:
-        engine = pyttsx3.init()
-        
-        # Configure voice properties for elderly users
-        engine.setProperty('rate', 150)     # Speed - slightly slower
-        engine.setProperty('volume', 0.9)   # Volume - clear but not too loud
-        
-        # Get available voices
-        voices = engine.getProperty('voices')
-        if not voices:
-            print("⚠️ No TTS voices found. Please check system TTS settings.")
-            return
+        with _engine_lock:
+            engine = _get_engine()
             
-        # Select voice based on preference
-        selected_voice = None
-        for voice in voices:
-            voice_name = voice.name.lower()
-            if use_male_voice and ('david' in voice_name or 'male' in voice_name):
-                selected_voice = voice.id
-                break
-            elif not use_male_voice and ('zira' in voice_name or 'female' in voice_name):
-                selected_voice = voice.id
-                break
-        
-        # If preferred voice not found, use first available
-        if selected_voice:
-            engine.setProperty('voice', selected_voice)
-        else:
-            engine.setProperty('voice', voices[0].id)
-            print("⚠️ Preferred voice not found, using default voice")
-        
-        print(f"🔊 Speaking: {text}")
-        engine.say(text)
-        engine.runAndWait()
+            # Configure voice properties for elderly users
+            engine.setProperty('rate', 150)     # Speed - slightly slower
+            engine.setProperty('volume', 0.9)   # Volume - clear but not too loud
+            
+            voice_id, preferred = _resolve_voice(engine, use_male_voice)
+            if not voice_id:
+                print("⚠️ No TTS voices found. Please check system TTS settings.")
+                return
+            
+            # If preferred voice not found, use first available
+            engine.setProperty('voice', voice_id)
+            if not preferred:
+                print("⚠️ Preferred voice not found, using default voice")
+            
+            print(f"🔊 Speaking: {text}")
+            engine.say(text)
+            engine.runAndWait()
         return True
         
     except Exception as e:
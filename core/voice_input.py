@@ -1,14 +1,98 @@
 import sounddevice as sd
-from scipy.io.wavfile import write
+import numpy as np
 import subprocess
 import os
+import re
+import shutil
+import struct
+import tempfile
+import threading
+
+# Optional in-process whisper.cpp binding; keeps the model resident instead
+# of reloading it in a fresh whisper-cli process for every utterance
+try:
+    from pywhispercpp.model import Model as WhisperModel
+except ImportError:
+    WhisperModel = None
+
+# Optional CTranslate2 backend with int8 kernels; preferred over whisper.cpp
+# when installed
+try:
+    from faster_whisper import WhisperModel as FasterWhisperModel
+except ImportError:
+    FasterWhisperModel = None
+
+# Optional voice activity detection used to cut silence before transcription
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+VAD_AGGRESSIVENESS = 2  # 0 (least) .. 3 (most aggressive about filtering non-speech)
+VAD_FRAME_MS = 30
+VAD_PADDING_MS = 200  # speech kept on either side of every voiced frame
+BATCH_GAP_S = 1.0  # silence between clips joined into one whisper pass
+
+def _wav_header(fs, nbytes, channels=1):
+    """Build the 44-byte header of a 16-bit PCM WAV file."""
+    block_align = channels * 2
+    return struct.pack('<4sI4s4sIHHIIHH4sI',
+                       b'RIFF', 36 + nbytes, b'WAVE',
+                       b'fmt ', 16, 1, channels, fs, fs * block_align, block_align, 16,
+                       b'data', nbytes)
+
+def _write_wav_int16(path, fs, data):
+    """Write an int16 sample buffer as a PCM WAV file with bulk buffered writes."""
+    pcm = data.astype('<i2', copy=False).tobytes()
+    channels = data.shape[1] if data.ndim > 1 else 1
+    with open(path, 'wb', buffering=1 << 16) as f:
+        f.write(_wav_header(fs, len(pcm), channels))
+        f.write(pcm)
+
+def _read_wav_int16(path):
+    """Memory-map the samples of a 16-bit mono PCM WAV written by `record_audio`.
+
+    The map is read-only and backed by the file, so copy anything that must
+    outlive a rewrite of it.
+    """
+    if os.path.getsize(path) <= 44:
+        return np.zeros(0, dtype='<i2')
+    return np.memmap(path, dtype='<i2', mode='r', offset=44)
+
+def _vad_segments(path, fs=16000):
+    """Split a recording into its voiced stretches, each with 200 ms padding.
+
+    Returns a list of int16 arrays: the whole recording as one segment when
+    webrtcvad is not installed, or an empty list when no speech was found.
+    """
+    audio = _read_wav_int16(path)
+    frame_len = fs * VAD_FRAME_MS // 1000
+    n_frames = len(audio) // frame_len
+    if webrtcvad is None or n_frames == 0:
+        return [np.array(audio)]
+
+    vad = webrtcvad.Vad(VAD_AGGRESSIVENESS)
+    frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len)
+    voiced = np.fromiter((vad.is_speech(frame.tobytes(), fs) for frame in frames),
+                         dtype=bool, count=n_frames)
+
+    # Widen every voiced frame by the padding on both sides
+    pad = VAD_PADDING_MS // VAD_FRAME_MS
+    keep = np.convolve(voiced.astype(np.int8), np.ones(2 * pad + 1, dtype=np.int8), mode='same') > 0
+
+    # Start/end frame indices of each run of kept frames
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], keep.view(np.int8), [0]))))
+    return [np.array(frames[start:end].reshape(-1)) for start, end in zip(edges[::2], edges[1::2])]
 
 # 🧠 Step 1: Record voice from mic
-def record_audio(duration=8, filename="data/audio/audio.wav"):
+def record_audio(duration=8, filename="data/audio/audio.wav", return_audio=False):
     """Record audio from the default microphone with clear visual feedback.
 
     Returns the path to the saved WAV file on success, or None on failure
-    (including user interrupt via Ctrl-C).
+    (including user interrupt via Ctrl-C). With `return_audio=True` it
+    returns `(path, segments)`, the int16 speech segments found by VAD (or
+    the whole recording as one segment), so `transcribe_audio` can decode
+    them directly instead of reading the file back.
     """
     print("\n" + "="*50)
     print("Ready to Listen!")
@@ -20,93 +104,372 @@ def record_audio(duration=8, filename="data/audio/audio.wav"):
         os.makedirs(parent, exist_ok=True)
 
     fs = 16000  # Sample rate (16 kHz)
+    target_frames = int(duration * fs)
+
+    # Stream blocks from the microphone straight into the file instead of
+    # holding the whole recording in memory; the header's sizes are
+    # patched in once recording stops
+    frames_written = 0
+    done = threading.Event()
+
+    def callback(indata, frames, time_info, status):
+        nonlocal frames_written
+        remaining = target_frames - frames_written
+        block = indata[:remaining]
+        f.write(block.tobytes())
+        frames_written += len(block)
+        if frames_written >= target_frames:
+            raise sd.CallbackStop
 
     try:
-        audio = sd.rec(int(duration * fs), samplerate=fs, channels=1, dtype='int16')
-        sd.wait()  # Wait until recording finishes
-    except KeyboardInterrupt:
-        # User interrupted recording (Ctrl-C). Stop the stream and return None.
+        f = open(filename, 'wb', buffering=1 << 16)
+    except Exception as e:
+        print(f"Failed to save recording: {e}")
+        return None
+
+    with f:
         try:
-            sd.stop()
-        except Exception:
-            pass
-        print("Recording interrupted by user.")
+            f.write(_wav_header(fs, 0))
+            stream = sd.InputStream(samplerate=fs, channels=1, dtype='int16',
+                                    blocksize=1024, callback=callback,
+                                    finished_callback=done.set)
+            with stream:
+                done.wait()  # Wait until recording finishes
+        except KeyboardInterrupt:
+            # User interrupted recording (Ctrl-C). Stop the stream and return None.
+            print("Recording interrupted by user.")
+            return None
+        except Exception as e:
+            print(f"Recording failed: {e}")
+            return None
+
+        try:
+            f.seek(0)
+            f.write(_wav_header(fs, frames_written * 2))
+        except Exception as e:
+            print(f"Failed to save recording: {e}")
+            return None
+
+    # Cut the silence so whisper only encodes speech; if VAD finds nothing,
+    # keep the full recording rather than risk dropping a quiet voice
+    segments = None
+    if webrtcvad is not None:
+        try:
+            found = _vad_segments(filename, fs)
+            speech = sum(len(segment) for segment in found)
+            if 0 < speech < frames_written:
+                _write_wav_int16(filename, fs, np.concatenate(found))
+                segments = found
+                print(f"Trimmed silence: kept {speech / fs:.1f}s of {frames_written / fs:.1f}s "
+                      f"in {len(found)} segment(s)")
+        except Exception as e:
+            print(f"Silence trimming skipped: {e}")
+
+    print(f"Recording complete. Saved as {filename}")
+    if not return_audio:
+        return filename
+    if segments is None:
+        try:
+            segments = [np.array(_read_wav_int16(filename))]
+        except Exception as e:
+            print(f"Failed to read back recording: {e}")
+            return None
+    return filename, segments
+
+
+# 🧠 Step 2: Transcribe using Whisper.cpp
+WHISPER_EXE = "whisper.cpp/build/bin/Release/whisper-cli.exe"  # Updated to use whisper-cli.exe
+WHISPER_MODEL_PATH = "models/ggml-small-q8_0.bin"
+FASTER_WHISPER_MODEL = "small"  # faster-whisper model size or local CTranslate2 model dir
+
+# Text after the last ']' of a "[00:00:00.000 --> 00:00:02.000]  text" line
+_SEGMENT_TEXT_RE = re.compile(r'^.*-->.*\]([^\]\n]*)$', re.MULTILINE)
+# Any non-blank line that isn't whisper.cpp's own log output
+_FALLBACK_TEXT_RE = re.compile(r'^(?!whisper_|system_info:|main:|\[)(.*\S.*)$', re.MULTILINE)
+
+def _parse_whisper_output(output):
+    """Pull the spoken text out of whisper-cli's stdout."""
+    # Look for the transcribed text after the segment timestamps
+    transcribed_text = ' '.join(
+        t.strip() for t in _SEGMENT_TEXT_RE.findall(output) if t.strip()
+    )
+
+    if not transcribed_text:
+        # Fallback: look for any text in the output
+        transcribed_text = ' '.join(
+            t.strip() for t in _FALLBACK_TEXT_RE.findall(output)
+        )
+
+    return transcribed_text
+
+
+def _report_transcriptions(items, texts, single):
+    """Print each result and shape the return value like the input."""
+    for i, (item, text) in enumerate(zip(items, texts)):
+        if text:
+            print(f"\n Transcribed Text: {text}")
+        else:
+            print(f" No transcribed text found for {item if isinstance(item, str) else f'clip {i}'}")
+
+    texts = [text or None for text in texts]
+    return texts[0] if single else texts
+
+
+def _read_txt_output(audio_path):
+    """Read the `<audio>.txt` file whisper-cli writes for `-otxt`."""
+    try:
+        with open(audio_path + ".txt", "r", encoding="utf-8") as f:
+            return ' '.join(line.strip() for line in f if line.strip())
+    except OSError:
+        return ""
+
+
+_whisper_model = None
+_whisper_lock = threading.Lock()
+_whisper_failed = False
+
+
+def _get_whisper_model():
+    """Load the pywhispercpp model once; None if the binding is unavailable."""
+    global _whisper_model, _whisper_failed
+    if WhisperModel is None or _whisper_failed:
         return None
+    with _whisper_lock:
+        if _whisper_model is None and not _whisper_failed:
+            try:
+                _whisper_model = WhisperModel(
+                    WHISPER_MODEL_PATH,
+                    n_threads=max(1, (os.cpu_count() or 2) // 2),
+                    print_realtime=False,
+                    print_progress=False,
+                )
+            except Exception as e:
+                print(f"In-process Whisper unavailable, using whisper-cli: {e}")
+                _whisper_failed = True
+        return _whisper_model
+
+
+_faster_model = None
+_faster_failed = False
+
+
+def _get_faster_whisper():
+    """Load the faster-whisper int8 model once; None if it is unavailable."""
+    global _faster_model, _faster_failed
+    if FasterWhisperModel is None or _faster_failed:
+        return None
+    with _whisper_lock:
+        if _faster_model is None and not _faster_failed:
+            try:
+                _faster_model = FasterWhisperModel(FASTER_WHISPER_MODEL, device="cpu",
+                                                   compute_type="int8")
+            except Exception as e:
+                print(f"faster-whisper unavailable, using Whisper.cpp: {e}")
+                _faster_failed = True
+        return _faster_model
+
+
+def _transcribe_faster(model, items):
+    """Transcribe each path, array or segment list with faster-whisper, or None on failure."""
+    texts = []
+    try:
+        with _whisper_lock:
+            for item in items:
+                if isinstance(item, list):
+                    # faster-whisper runs its own VAD, so give it the speech in one piece
+                    item = np.concatenate(item)
+                media = item if isinstance(item, str) else _to_float32(item)
+                # Greedy decoding is enough for short dictation and halves decode time
+                segments, _ = model.transcribe(media, language="en", beam_size=1,
+                                               vad_filter=True)
+                texts.append(' '.join(s.text.strip() for s in segments if s.text.strip()))
     except Exception as e:
-        print(f"Recording failed: {e}")
+        print(f"faster-whisper transcription failed, using Whisper.cpp: {e}")
         return None
+    return texts
+
+
+def _to_float32(audio):
+    """Convert int16 PCM to the float32 [-1, 1] samples whisper expects."""
+    if audio.dtype == np.int16:
+        return audio.astype(np.float32) / 32768.0
+    return audio.astype(np.float32, copy=False)
+
+
+def _to_int16(audio):
+    """Convert float32 [-1, 1] samples back to int16 PCM for a WAV file."""
+    if audio.dtype == np.int16:
+        return audio
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def _transcribe_batched(model, clips, fs=16000):
+    """Transcribe several arrays in one whisper pass by joining them with silence.
 
+    Each returned segment goes back to the clip its midpoint falls in.
+    """
+    gap = np.zeros(int(fs * BATCH_GAP_S), dtype=np.float32)
+    pieces = []
+    starts = []
+    offset = 0
+    for clip in clips:
+        starts.append(offset)
+        pieces += [_to_float32(clip), gap]
+        offset += len(clip) + len(gap)
+
+    texts = [[] for _ in clips]
+    bounds = np.array(starts[1:])
+    for segment in model.transcribe(np.concatenate(pieces), language="en"):
+        text = segment.text.strip()
+        if text:
+            # Segment times are in 10 ms units
+            mid = (segment.t0 + segment.t1) * fs // 200
+            texts[int(np.searchsorted(bounds, mid, side='right'))].append(text)
+    return [' '.join(t) for t in texts]
+
+
+def _transcribe_in_process(model, items):
+    """Transcribe each path, array or segment list with the resident model, or None on failure."""
+    texts = []
     try:
-        write(filename, fs, audio)  # Save file
-        print(f"Recording complete. Saved as {filename}")
-        return filename
+        with _whisper_lock:
+            if len(items) > 1 and all(isinstance(item, np.ndarray) for item in items):
+                return _transcribe_batched(model, items)
+            for item in items:
+                if isinstance(item, list):
+                    # The VAD segments of one recording, decoded in a single pass
+                    if len(item) > 1:
+                        texts.append(' '.join(t for t in _transcribe_batched(model, item) if t))
+                        continue
+                    item = item[0]
+                media = item if isinstance(item, str) else _to_float32(item)
+                segments = model.transcribe(media, language="en")
+                texts.append(' '.join(s.text.strip() for s in segments if s.text.strip()))
     except Exception as e:
-        print(f"Failed to save recording: {e}")
+        print(f"In-process transcription failed, using whisper-cli: {e}")
         return None
+    return texts
 
 
-# 🧠 Step 2: Transcribe using Whisper.cpp
-def transcribe_audio(audio_path):
-    whisper_exe = "whisper.cpp/build/bin/Release/whisper-cli.exe"  # Updated to use whisper-cli.exe
-    model_path = "models/ggml-small-q8_0.bin"
+def _is_recording(item):
+    """True for the `(path, segments)` pair returned by `record_audio`."""
+    return (isinstance(item, tuple) and len(item) == 2 and isinstance(item[0], str)
+            and (isinstance(item[1], np.ndarray)
+                 or (isinstance(item[1], list) and len(item[1]) > 0
+                     and all(isinstance(s, np.ndarray) for s in item[1]))))
 
-    # Check if paths exist
-    if not os.path.exists(whisper_exe):
-        print("Whisper executable not found! Check build path.")
+
+def transcribe_audio(audio):
+    """Transcribe a WAV path or 16 kHz mono array, or a list of them in one run.
+
+    Also accepts the `(path, segments)` pair from `record_audio(return_audio=True)`:
+    in-process backends use the speech segments (pywhispercpp decodes them in
+    one pass), whisper-cli uses the saved, already trimmed file.
+
+    Backends are tried fastest first: faster-whisper (int8, greedy, with its
+    own VAD filter), then the in-process pywhispercpp model. Both take arrays
+    directly without a WAV round trip, and pywhispercpp decodes a list of
+    arrays (such as the `_vad_segments` of a recording) in a single pass.
+    Otherwise whisper-cli takes several `-f` files per invocation, so a batch
+    only pays the model load once. A single input returns the text (or None);
+    a list returns a list of the same length.
+    """
+    # record_audio returns None when recording fails
+    if audio is None:
         return None
-    if not os.path.exists(model_path):
+    single = isinstance(audio, (str, np.ndarray)) or _is_recording(audio)
+    inputs = [audio] if single else list(audio)
+    failed = None if single else [None] * len(inputs)
+    if not inputs:
+        return failed
+
+    # In-process backends take the samples, whisper-cli takes the file
+    items = [item[1] if _is_recording(item) else item for item in inputs]
+    files = [item[0] if _is_recording(item) else item for item in inputs]
+
+    model = _get_faster_whisper()
+    if model is not None:
+        print("Transcribing using faster-whisper...")
+        texts = _transcribe_faster(model, items)
+        if texts is not None:
+            return _report_transcriptions(files, texts, single)
+
+    if not os.path.exists(WHISPER_MODEL_PATH):
         print("Model file not found! Place model in models/ folder.")
-        return None
+        return failed
+
+    model = _get_whisper_model()
+    if model is not None:
+        print("Transcribing using Whisper.cpp (in-process)...")
+        texts = _transcribe_in_process(model, items)
+        if texts is not None:
+            return _report_transcriptions(files, texts, single)
+
+    # Check if paths exist
+    if not os.path.exists(WHISPER_EXE):
+        print("Whisper executable not found! Check build path.")
+        return failed
+
+    # whisper-cli only reads files, so arrays are written to temporary WAVs
+    tmp_dir = None
+    paths = []
+    try:
+        for item in files:
+            if isinstance(item, str):
+                paths.append(item)
+                continue
+            if tmp_dir is None:
+                tmp_dir = tempfile.mkdtemp(prefix="sathi_stt_")
+            path = os.path.join(tmp_dir, f"clip_{len(paths)}.wav")
+            _write_wav_int16(path, 16000, _to_int16(item))
+            paths.append(path)
+        return _transcribe_with_cli(paths, single, failed)
+    except Exception as e:
+        print(f"Transcription failed with error: {e}")
+        return failed
+    finally:
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _transcribe_with_cli(paths, single, failed):
+    """Run whisper-cli once over all paths and collect each -otxt transcript."""
+    # Drop stale -otxt output so an old transcript is never picked up
+    for path in paths:
+        try:
+            os.remove(path + ".txt")
+        except OSError:
+            pass
 
     print("Transcribing using Whisper.cpp...")
-    command = [whisper_exe, "-m", model_path, "-f", audio_path, "--language", "en"]
+    command = [WHISPER_EXE, "-m", WHISPER_MODEL_PATH, "--language", "en", "-otxt"]
+    for path in paths:
+        command += ["-f", path]
     
     try:
-        result = subprocess.run(command, capture_output=True, text=True, timeout=60)
+        result = subprocess.run(command, capture_output=True, text=True, timeout=60 * len(paths))
         
         # Check for errors
         if result.returncode != 0:
             print(f"Transcription failed with return code: {result.returncode}")
             print(f"Error output: {result.stderr}")
-            return None
+            return failed
             
-        # Extract transcribed text from the output
-        output = result.stdout
-        print(f"Raw whisper output: {output}")
-        
-        # Look for the transcribed text in the output
-        lines = output.split('\n')
-        transcribed_text = ""
-        
-        for line in lines:
-            if '-->' in line and ']' in line:
-                # Extract text after the timestamp
-                if ']' in line:
-                    text_part = line.split(']')[-1].strip()
-                    if text_part:
-                        transcribed_text += text_part + " "
-        
-        if not transcribed_text.strip():
-            # Fallback: look for any text in the output
-            for line in lines:
-                if line.strip() and not line.startswith('whisper_') and not line.startswith('system_info:') and not line.startswith('main:') and not line.startswith('['):
-                    transcribed_text += line.strip() + " "
+        # Prefer the per-file .txt output over parsing stdout
+        texts = [_read_txt_output(path) for path in paths]
+        if single and not texts[0]:
+            output = result.stdout
+            print(f"Raw whisper output: {output}")
+            texts[0] = _parse_whisper_output(output)
 
-        transcribed_text = transcribed_text.strip()
-        
-        if transcribed_text:
-            print(f"\n Transcribed Text: {transcribed_text}")
-            return transcribed_text
-        else:
-            print(" No transcribed text found in output")
-            return None
+        return _report_transcriptions(paths, texts, single)
             
     except subprocess.TimeoutExpired:
         print("Transcription timed out")
-        return None
+        return failed
     except Exception as e:
         print(f"Transcription failed with error: {e}")
-        return None
+        return failed
 
 
 # 🧠 Step 3: Save transcription to file
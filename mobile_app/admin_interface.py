@@ -2,8 +2,12 @@
 Simple Flask web interface for family members/admins to manage tasks.
 """
 
-from flask import Flask, request, render_template, redirect, url_for, flash
+from flask import (Flask, request, render_template, redirect, url_for, flash,
+                   get_flashed_messages, make_response)
+import hashlib
+import json
 import sys
+import threading
 from pathlib import Path
 
 # Add project root to path for imports
@@ -11,16 +15,45 @@ project_root = Path(__file__).resolve().parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from core.task_manager import add_task, fetch_tasks, delete_task
+from core.task_manager import add_task, fetch_tasks, delete_task, get_data_version
 
 app = Flask(__name__)
 app.secret_key = 'sathi_admin_secret_key'  # Required for flash messages
 
+# In-process copy of the task list. It is dropped when a task is added or
+# deleted here, and re-read when SQLite's data_version shows that another
+# process (e.g. the scheduler) changed the database.
+_TASKS_CACHE = {'tasks': None, 'version': None, 'etag': None}
+_tasks_lock = threading.Lock()
+
+def _get_tasks():
+    """Return (tasks, etag), only querying the database when it has changed."""
+    version = get_data_version()
+    with _tasks_lock:
+        if (_TASKS_CACHE['tasks'] is None or version is None
+                or version != _TASKS_CACHE['version']):
+            tasks = fetch_tasks()
+            etag = hashlib.md5(json.dumps(tasks, sort_keys=True, default=str).encode()).hexdigest()
+            _TASKS_CACHE.update(tasks=tasks, version=version, etag=etag)
+        return _TASKS_CACHE['tasks'], _TASKS_CACHE['etag']
+
+def _invalidate_tasks():
+    """Forget the cached task list after a change made by this app."""
+    with _tasks_lock:
+        _TASKS_CACHE['tasks'] = None
+
 @app.route('/')
 def index():
     """Display the task management interface and list of tasks."""
-    tasks = fetch_tasks()
-    return render_template('admin.html', tasks=tasks)
+    tasks, etag = _get_tasks()
+    # Let the browser reuse its copy unless there are flash messages to show
+    if not get_flashed_messages() and etag in request.if_none_match:
+        response = make_response('', 304)
+    else:
+        response = make_response(render_template('admin.html', tasks=tasks))
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 @app.route('/add_task', methods=['POST'])
 def handle_add_task():
@@ -34,6 +67,7 @@ def handle_add_task():
         return redirect(url_for('index'))
     
     if add_task(time, message, repeat_daily):
+        _invalidate_tasks()
         flash('Task added successfully!', 'success')
     else:
         flash('Error adding task. Please check the time format (HH:MM).', 'error')
@@ -44,6 +78,7 @@ def handle_add_task():
 def handle_delete_task(task_id):
     """Handle task deletion."""
     if delete_task(task_id):
+        _invalidate_tasks()
         flash('Task deleted successfully!', 'success')
     else:
         flash('Error deleting task', 'error')
@@ -53,4 +88,10 @@ if __name__ == '__main__':
     print("\n💻 Starting Sathi Admin Interface...")
     print("🌐 Open your web browser and go to: http://localhost:5000")
     print("📝 You can add and manage tasks for the elderly user there\n")
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    try:
+        from waitress import serve
+    except ImportError:
+        print("⚠️ waitress not installed, falling back to Flask's server (pip install waitress)")
+        app.run(debug=False, port=5000, threaded=True)
+    else:
+        serve(app, host='127.0.0.1', port=5000, threads=8)
\ No newline at end of file
@@ -6,8 +6,13 @@ Save this file in the root of your whisper.cpp project (so relative paths work).
 import sounddevice as sd
 import numpy as np
 import os
+import re
+import json
 import time
+import queue
+import threading
 import subprocess
+from collections import OrderedDict, deque
 import sys
 
 
@@ -17,13 +22,22 @@ WHISPER_MODEL = r"models\ggml-small-q8_0.bin"
 AUDIO_FILE = "audio.wav"
 TXT_FILE = "audio.wav.txt"
 POLL_INTERVAL = 1.0   # सेकंदांत तपासणी (कम करा -> अधिक sensitive, वाढवू शकता)
+SETTLE_CHECK = 0.05   # file size must be unchanged this long to count as written
+SETTLE_TIMEOUT = 2.0
 QWEN_MODEL_NAME = "qwen2.5"  # तुमच्या Ollama वर available model नाव ठेवा
+KEEP_ALIVE = "24h"   # Ollama ने model memory मध्ये किती वेळ ठेवायचा (idle असताना)
+ANSWER_CACHE_FILE = "qa_cache.json"   # recent answers, kept across restarts
+ANSWER_CACHE_SIZE = 64
+ANSWER_CACHE_TTL = 7 * 24 * 3600       # सेकंद; जुनी उत्तरे पुन्हा विचारली जातात
 # ---------------------------------------------------------
 
 # optional conversation context (history)
 CONTEXT = [
     {"role": "system", "content": "You are a helpful assistant."}
 ]
+# last few user/assistant messages; the oldest drop off so prompts stay short
+HISTORY_LENGTH = 8
+HISTORY = deque(maxlen=HISTORY_LENGTH)
 
 # try imports
 try:
@@ -38,7 +52,26 @@ except Exception as e:
     print("Missing python package 'pyttsx3'. कृपया: pip install pyttsx3")
     raise
 
-engine = pyttsx3.init()
+# optional: in-process whisper.cpp binding (model stays loaded between questions)
+try:
+    from pywhispercpp.model import Model as WhisperModel
+except ImportError:
+    WhisperModel = None
+
+# optional: OS file-change notifications instead of mtime polling
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+
+whisper_model = None
+
+# sentences waiting to be spoken by the TTS worker thread
+speech_queue = queue.Queue()
+tts_thread = None
+# end of a sentence: . ! ? followed by whitespace, or a newline
+SENTENCE_END_RE = re.compile(r"[.!?](?=\s)|\n")
 
 def run_whisper():
     """Run whisper-cli to transcribe audio.wav -> audio.wav.txt"""
@@ -53,6 +86,37 @@ def run_whisper():
     subprocess.run(cmd, check=True)
     print("[1] Whisper finished.")
 
+def load_whisper_model():
+    """Load the pywhispercpp model once; None -> fall back to whisper-cli"""
+    global whisper_model, WhisperModel
+    if whisper_model is None and WhisperModel is not None:
+        try:
+            whisper_model = WhisperModel(
+                WHISPER_MODEL,
+                n_threads=max(1, (os.cpu_count() or 2) // 2),
+                print_realtime=False,
+                print_progress=False,
+            )
+        except Exception as e:
+            print("pywhispercpp could not load the model, using whisper-cli:", e)
+            WhisperModel = None
+    return whisper_model
+
+def transcribe():
+    """Return the transcript of audio.wav, in-process if possible"""
+    model = load_whisper_model()
+    if model is not None:
+        print("[1] Transcribing in-process ...")
+        try:
+            segments = model.transcribe(AUDIO_FILE, language="en")
+        except Exception as e:
+            print("In-process transcription failed, using whisper-cli:", e)
+        else:
+            print("[1] Whisper finished.")
+            return " ".join(s.text.strip() for s in segments if s.text.strip())
+    run_whisper()
+    return read_transcript()
+
 def read_transcript():
     """Return trimmed text from audio.wav.txt"""
     if not os.path.exists(TXT_FILE):
@@ -60,66 +124,266 @@ def read_transcript():
     with open(TXT_FILE, "r", encoding="utf-8") as f:
         return f.read().strip()
 
-def ask_qwen(question):
-    """Send question to Qwen via ollama.chat and return answer text"""
-    messages = CONTEXT.copy()
-    messages.append({"role": "user", "content": question})
-    print("[2] Sending to Qwen...")
-    resp = chat(model=QWEN_MODEL_NAME, messages=messages, stream=False)
+def warm_up_qwen():
+    """Load the model into Ollama now so the first real question isn't slow"""
+    print("Warming up Qwen ...")
+    try:
+        chat(model=QWEN_MODEL_NAME, messages=[{"role": "user", "content": "hi"}],
+             stream=False, keep_alive=KEEP_ALIVE, options={"num_predict": 1})
+    except Exception as e:
+        print("Warmup failed (will load on first question):", e)
+
+def message_content(resp, default=""):
+    """Pull the message text out of an ollama chat response / stream chunk"""
     # try common extraction
     if isinstance(resp, dict):
-        return resp.get("message", {}).get("content", str(resp))
+        return resp.get("message", {}).get("content", default)
     else:
         # fallback
         try:
-            return resp.message.get("content", str(resp))
+            return resp.message.get("content", default)
         except Exception:
-            return str(resp)
+            return default
+
+def ask_qwen(question):
+    """Stream the answer from Qwen, speaking each sentence as soon as it is complete.
+
+    Returns the full answer text.
+    """
+    messages = CONTEXT + list(HISTORY)
+    messages.append({"role": "user", "content": question})
+    print("[2] Sending to Qwen...")
+    parts = []
+    pending = []   # pieces of the sentence still being generated
+    for chunk in chat(model=QWEN_MODEL_NAME, messages=messages, stream=True,
+                      keep_alive=KEEP_ALIVE):
+        delta = message_content(chunk)
+        if not delta:
+            continue
+        parts.append(delta)
+        # only the new piece (plus the char before it, for ". " split across
+        # chunks) can end a sentence, so skip the join until it does
+        prev = pending[-1][-1:] if pending else ""
+        pending.append(delta)
+        if not SENTENCE_END_RE.search(prev + delta):
+            continue
+        # hand every finished sentence to the TTS worker while more tokens arrive
+        buffer = "".join(pending)
+        last_end = 0
+        for match in SENTENCE_END_RE.finditer(buffer):
+            speak_text(buffer[last_end:match.end()])
+            last_end = match.end()
+        pending = [buffer[last_end:]] if last_end < len(buffer) else []
+    speak_text("".join(pending))
+    return "".join(parts)
+
+# recent answers to self-contained questions, keyed by (model, normalized
+# question), least recently used first; each value is (answer, time it was cached)
+answer_cache = OrderedDict()
+
+# answers to these change over time, so they are never cached
+TIME_SENSITIVE_RE = re.compile(
+    r"\b(time|date|day|today|tonight|tomorrow|yesterday|now|week|month|year|"
+    r"morning|evening|weather|news|latest|current)\b")
+
+# follow-ups ("why?", "tell me more", "who wrote it") only make sense with the
+# conversation in HISTORY, so they always go to Qwen and are never cached
+FOLLOW_UP_RE = re.compile(
+    r"\b(why|it|its|this|that|these|those|he|she|him|her|his|they|them|their|"
+    r"more|again|else|also|too|another|other)\b|^(and|but|so|then|what about)\b")
+FOLLOW_UP_MAX_WORDS = 2   # "and you", "really" ... too short to stand alone
+
+def normalize_question(text):
+    """Lowercase and drop punctuation/extra spaces so repeats compare equal"""
+    return re.sub(r"\W+", " ", text.lower()).strip()
+
+def is_follow_up(normalized):
+    """True if a (normalized) question leans on the earlier conversation"""
+    return (len(normalized.split()) <= FOLLOW_UP_MAX_WORDS
+            or FOLLOW_UP_RE.search(normalized) is not None)
+
+def load_answer_cache():
+    """Restore the answer cache saved by a previous run (expired entries dropped)"""
+    try:
+        with open(ANSWER_CACHE_FILE, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return
+    except Exception as e:
+        print("Could not load answer cache:", e)
+        return
+    now = time.time()
+    for entry in entries:
+        try:
+            key, ans, saved_at = tuple(entry["key"]), str(entry["answer"]), float(entry["time"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if now - saved_at < ANSWER_CACHE_TTL:
+            answer_cache[key] = (ans, saved_at)
+
+def save_answer_cache():
+    """Write the answer cache to disk (temp file + rename, so it is never half-written)"""
+    tmp = ANSWER_CACHE_FILE + ".tmp"
+    entries = [{"key": list(key), "answer": ans, "time": saved_at}
+               for key, (ans, saved_at) in answer_cache.items()]
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp, ANSWER_CACHE_FILE)
+    except Exception as e:
+        print("Could not save answer cache:", e)
+
+def cached_answer(question):
+    """Answer from the cache if this question was asked recently, else ask Qwen
+
+    Only self-contained questions use the cache, so they are keyed by the
+    question alone and a repeat later in the session still hits. Follow-ups
+    and time-sensitive questions always go to Qwen and are not stored.
+    """
+    normalized = normalize_question(question)
+    cacheable = not (TIME_SENSITIVE_RE.search(normalized) or is_follow_up(normalized))
+    key = (QWEN_MODEL_NAME, normalized)
+    hit = answer_cache.get(key) if cacheable else None
+    if hit is not None and time.time() - hit[1] >= ANSWER_CACHE_TTL:
+        del answer_cache[key]
+        hit = None
+    if hit is not None:
+        ans = hit[0]
+        answer_cache.move_to_end(key)
+        print("[2] Answer found in cache.")
+        speak_text(ans)
+    else:
+        ans = ask_qwen(question)
+        if not ans:
+            return ans
+        if cacheable:
+            answer_cache[key] = (ans, time.time())
+            while len(answer_cache) > ANSWER_CACHE_SIZE:
+                answer_cache.popitem(last=False)
+            save_answer_cache()
+    HISTORY.append({"role": "user", "content": question})
+    HISTORY.append({"role": "assistant", "content": ans})
+    return ans
+
+def tts_worker():
+    """Speak queued sentences in order (pyttsx3 engine lives on this thread)"""
+    engine = pyttsx3.init()
+    while True:
+        text = speech_queue.get()
+        try:
+            engine.say(text)
+            engine.runAndWait()
+        except Exception as e:
+            print("TTS error:", e)
+        finally:
+            speech_queue.task_done()
 
 def speak_text(text):
-    """Speak answer using pyttsx3 (offline)"""
-    print("[3] Speaking answer...")
-    engine.say(text)
-    engine.runAndWait()
+    """Queue text to be spoken using pyttsx3 (offline)"""
+    global tts_thread
+    text = text.strip()
+    if not text:
+        return
+    if tts_thread is None:
+        tts_thread = threading.Thread(target=tts_worker, daemon=True)
+        tts_thread.start()
+        print("[3] Speaking answer...")
+    speech_queue.put(text)
+
+def start_watcher(changes):
+    """Post audio.wav change events to `changes`; None if watchdog is missing"""
+    if Observer is None:
+        return None
+    target = os.path.abspath(AUDIO_FILE)
+
+    class AudioFileHandler(FileSystemEventHandler):
+        def on_created(self, event):
+            self.check(event.src_path)
+
+        def on_modified(self, event):
+            self.check(event.src_path)
+
+        def on_moved(self, event):
+            self.check(event.dest_path)
+
+        def check(self, path):
+            if os.path.abspath(path) == target:
+                changes.put(path)
+
+    observer = Observer()
+    observer.schedule(AudioFileHandler(), os.path.dirname(target), recursive=False)
+    observer.start()
+    return observer
+
+def wait_until_written(path, timeout=SETTLE_TIMEOUT):
+    """Wait until the file size stops changing (writer finished)"""
+    deadline = time.monotonic() + timeout
+    last_size = -1
+    while time.monotonic() < deadline:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = -1
+        if size == last_size and size > 0:
+            return
+        last_size = size
+        time.sleep(SETTLE_CHECK)
 
 def main():
     print("=== Whisper -> Qwen loop starting ===")
     print("Ensure: 'ollama serve' is running in another terminal (so model isn't reloaded each time).")
-    if not os.path.exists(WHISPER_CLI):
+    if WhisperModel is None and not os.path.exists(WHISPER_CLI):
         print(f"Warning: whisper-cli not found at {WHISPER_CLI}. Edit WHISPER_CLI path in script.")
     if not os.path.exists(WHISPER_MODEL):
         print(f"Warning: whisper model not found at {WHISPER_MODEL}. Edit WHISPER_MODEL path in script.")
+    warm_up_qwen()
     last_mtime = 0
     last_question = None
+    load_answer_cache()
 
     # If audio file exists, record its current mtime
     if os.path.exists(AUDIO_FILE):
         last_mtime = os.path.getmtime(AUDIO_FILE)
 
+    # Block on file-change events instead of polling when watchdog is installed
+    changes = queue.Queue()
+    observer = start_watcher(changes)
+    if observer is None:
+        print("Tip: pip install watchdog to react to audio.wav instantly (polling for now).")
+
     try:
         while True:
             try:
+                if observer is not None:
+                    try:
+                        changes.get(timeout=POLL_INTERVAL)
+                    except queue.Empty:
+                        continue
+                    # one write fires several events; handle them once
+                    while not changes.empty():
+                        changes.get_nowait()
                 if os.path.exists(AUDIO_FILE):
                     m = os.path.getmtime(AUDIO_FILE)
                     if m != last_mtime:
                         # new/changed audio detected
-                        last_mtime = m
-                        # small wait so file write completes
-                        time.sleep(0.5)
-                        run_whisper()
-                        q = read_transcript()
+                        # wait so file write completes
+                        wait_until_written(AUDIO_FILE)
+                        last_mtime = os.path.getmtime(AUDIO_FILE)
+                        q = transcribe()
                         if not q:
                             print("No transcript produced.")
                             continue
-                        if q == last_question:
+                        if normalize_question(q) == last_question:
                             print("Same question as previous — skipping.")
                             continue
                         print("Question:", q)
-                        last_question = q
-                        ans = ask_qwen(q)
+                        last_question = normalize_question(q)
+                        ans = cached_answer(q)
                         print("Answer:\n", ans)
-                        speak_text(ans)
-                time.sleep(POLL_INTERVAL)
+                        # finish speaking before listening for the next question
+                        speech_queue.join()
+                if observer is None:
+                    time.sleep(POLL_INTERVAL)
             except subprocess.CalledProcessError as e:
                 print("Error running whisper-cli:", e)
                 time.sleep(2)
@@ -128,6 +392,9 @@ def main():
                 time.sleep(2)
     except KeyboardInterrupt:
         print("Exiting loop. Bye.")
+        if observer is not None:
+            observer.stop()
+            observer.join()
         sys.exit(0)
 
 if __name__ == "__main__":